@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:10
+
+from django.db import migrations, models
+
+
+def backfill_standings(apps, schema_editor):
+    Team = apps.get_model('league', 'Team')
+    Match = apps.get_model('league', 'Match')
+
+    teams = {team.pk: team for team in Team.objects.all()}
+    for team in teams.values():
+        team.matches_played = team.wins = team.draws = team.losses = 0
+        team.goals_for = team.goals_against = team.goal_difference = team.points = 0
+
+    played = Match.objects.filter(is_played=True).values_list(
+        'home_team_id', 'away_team_id', 'home_score', 'away_score'
+    )
+    for home_id, away_id, home_score, away_score in played:
+        for team_id, gf, ga in ((home_id, home_score, away_score), (away_id, away_score, home_score)):
+            team = teams[team_id]
+            team.matches_played += 1
+            team.goals_for += gf
+            team.goals_against += ga
+            team.goal_difference += gf - ga
+            if gf > ga:
+                team.wins += 1
+                team.points += 3
+            elif gf == ga:
+                team.draws += 1
+                team.points += 1
+            else:
+                team.losses += 1
+
+    Team.objects.bulk_update(teams.values(), [
+        'matches_played', 'wins', 'draws', 'losses',
+        'goals_for', 'goals_against', 'goal_difference', 'points',
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0002_alter_match_options_alter_team_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['-points', '-goal_difference', '-goals_for'], name='team_standings_idx'),
+        ),
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0003_team_standings_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='jersey_number',
+            field=models.IntegerField(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='player',
+            unique_together={('team', 'jersey_number')},
+        ),
+    ]
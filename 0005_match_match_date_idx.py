@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0004_alter_player_jersey_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['match_date'], name='match_date_idx'),
+        ),
+    ]
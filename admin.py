@@ -1,7 +1,7 @@
 from django.contrib import admin
-from django.db.models import Sum, F
+from django.db.models import Count, Q
 # Ensure all models are imported, including Goal and Card
-from .models import Team, Player, Match, Referee, MatchReport, Goal, Card
+from .models import Team, Player, Match, Referee, MatchReport, Goal, Card, STANDINGS_COUNTERS
 
 # ----------------- INLINE ADMINS (FIXED) -----------------
 # These will be embedded directly into the MatchAdmin form
@@ -11,6 +11,14 @@ class GoalInline(admin.TabularInline):
     extra = 1
     # FIX: Changed 'player' to 'scorer' to match the model field name
     fields = ('scorer', 'team', 'minute') 
+    # Lookup widget instead of a full Player <select> on every inline row
+    raw_id_fields = ('scorer',)
+
+    def get_queryset(self, request):
+        # match__*_team: each row's __str__ renders the match and both teams
+        return super().get_queryset(request).select_related(
+            'scorer', 'team', 'match__home_team', 'match__away_team'
+        )
 
 class CardInline(admin.TabularInline):
     model = Card
@@ -19,6 +27,12 @@ class CardInline(admin.TabularInline):
     # 'player' in the Card model, as it was not renamed in the migration. 
     # Assuming 'player' is correct for Card.
     fields = ('player', 'card_type', 'minute', 'reason')
+    raw_id_fields = ('player',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'player__team', 'match__home_team', 'match__away_team'
+        )
 
 class MatchReportInline(admin.StackedInline):
     model = MatchReport
@@ -35,6 +49,9 @@ class MatchAdmin(admin.ModelAdmin):
     search_fields = ('home_team__name', 'away_team__name', 'referee__name')
     date_hierarchy = 'match_date'
 
+    # JOIN the FKs shown in each changelist row instead of fetching them per row
+    list_select_related = ('home_team', 'away_team', 'referee')
+
     # Embed the event tracking models and report into the Match form
     inlines = [GoalInline, CardInline, MatchReportInline]
     
@@ -44,7 +61,7 @@ class MatchAdmin(admin.ModelAdmin):
             'fields': ('home_team', 'away_team', 'referee', 'match_date', 'venue', 'is_played')
         }),
         ('Final Score (Calculated from Goals Below)', {
-            # These fields are read-only and will be updated in save_model
+            # These fields are read-only and will be updated in save_related
             'fields': ('home_score', 'away_score'),
             'classes': ('collapse',), # Hide by default
         }),
@@ -53,37 +70,63 @@ class MatchAdmin(admin.ModelAdmin):
     # Make score fields read-only so they are calculated, not manually entered
     readonly_fields = ('home_score', 'away_score',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('home_team', 'away_team', 'referee')
 
-    def save_model(self, request, obj, form, change):
+
+    def save_related(self, request, form, formsets, change):
         """
-        Overrides save_model to automatically calculate home_score and away_score 
-        from the Goals entered in the inline forms before saving the Match object.
+        Overrides save_related to automatically calculate home_score and away_score 
+        from the Goals entered in the inline forms once those inlines are saved.
         """
-        # Save the Match object first (needed for related Goal objects)
-        super().save_model(request, obj, form, change)
-        
-        # Recalculate scores based on the Goals related to this match object
-        
-        # Calculate Home Score
-        home_goals = obj.goals.filter(team=obj.home_team).count()
-        
-        # Calculate Away Score
-        away_goals = obj.goals.filter(team=obj.away_team).count()
-
-        # Update the Match object's score fields
+        super().save_related(request, form, formsets, change)
+        obj = form.instance
+
+        goal_formset = next((fs for fs in formsets if fs.model is Goal), None)
+        if goal_formset is not None:
+            # The inline formset holds every goal of the match already, so
+            # count its saved instances instead of querying again. (Not
+            # cleaned_data: for view-only inlines that is the raw initial data.)
+            home_goals = away_goals = 0
+            deleted_forms = goal_formset.deleted_forms
+            for goal_form in goal_formset.forms:
+                goal = goal_form.instance
+                if goal.pk is None or goal_form in deleted_forms:
+                    continue
+                if goal.team_id == obj.home_team_id:
+                    home_goals += 1
+                elif goal.team_id == obj.away_team_id:
+                    away_goals += 1
+        else:
+            # Goal inline not shown at all (no view permission): count both
+            # sides in a single aggregate query
+            totals = obj.goals.aggregate(
+                home=Count('pk', filter=Q(team_id=obj.home_team_id)),
+                away=Count('pk', filter=Q(team_id=obj.away_team_id)),
+            )
+            home_goals, away_goals = totals['home'] or 0, totals['away'] or 0
+
+        # Only write when the score actually moved
         if obj.home_score != home_goals or obj.away_score != away_goals:
             obj.home_score = home_goals
             obj.away_score = away_goals
             
-            # Save the object again with the updated scores, bypassing save_model recursion
-            Match.objects.filter(pk=obj.pk).update(
-                home_score=home_goals, 
-                away_score=away_goals
-            )
+            # Save through the model (not a queryset update) so the teams'
+            # standings counters follow the new score
+            obj.save(update_fields=['home_score', 'away_score'])
 
 
 # --- Registration for Other Models ---
 
 admin.site.register(Referee)
-admin.site.register(Team)
-admin.site.register(Player)
\ No newline at end of file
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    # The counters are maintained from match results; editing them here
+    # (or re-posting stale values) would corrupt the standings
+    readonly_fields = STANDINGS_COUNTERS
+
+@admin.register(Player)
+class PlayerAdmin(admin.ModelAdmin):
+    # Player.__str__ renders the team name
+    list_select_related = ('team',)
\ No newline at end of file
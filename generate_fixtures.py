@@ -1,14 +1,16 @@
 import datetime
 from django.core.management.base import BaseCommand, CommandError
-from django.db import connection
+from django.core.cache import caches
+from django.db import connection, transaction
 from django.utils import timezone # <-- NEW IMPORT
 from league.models import Team, Match
 
 class Command(BaseCommand):
-    help = 'Generates a full league schedule by saving each match individually and using timezone-aware dates.'
+    help = 'Generates a full league schedule in a single bulk insert using timezone-aware dates.'
 
     def handle(self, *args, **options):
         date_format = '%Y-%m-%d'
+        verbosity = int(options.get('verbosity', 1))
         
         # --- Start Date Hardcoded and Made Timezone-Aware ---
         start_date_naive = datetime.datetime.combine(
@@ -20,9 +22,12 @@ class Command(BaseCommand):
         
         days_between_weeks = 7 
         
-        self.stdout.write(self.style.NOTICE("--- Starting Individual Fixture Generation (Timezone Aware) ---"))
-        self.stdout.write(self.style.SUCCESS(f"Start Date set to: {start_date.strftime(date_format)} (Timezone Aware)"))
-        self.stdout.write(self.style.SUCCESS(f"Match days separated by: {days_between_weeks} days"))
+        # Output is collected per phase and written once instead of line by line
+        self.stdout.write('\n'.join([
+            self.style.NOTICE("--- Starting Bulk Fixture Generation (Timezone Aware) ---"),
+            self.style.SUCCESS(f"Start Date set to: {start_date.strftime(date_format)} (Timezone Aware)"),
+            self.style.SUCCESS(f"Match days separated by: {days_between_weeks} days"),
+        ]))
 
         all_teams = list(Team.objects.all().order_by('pk'))
         num_actual_teams = len(all_teams)
@@ -35,12 +40,13 @@ class Command(BaseCommand):
         # --- Round-Robin Setup ---
         
         if num_actual_teams % 2 != 0:
-            teams = all_teams + [None]
+            teams = tuple(all_teams) + (None,)
         else:
-            teams = all_teams
+            teams = tuple(all_teams)
         
         num_teams = len(teams)
         total_rounds = num_teams - 1 
+        pivot = teams[total_rounds] # Fixed team of the circle design
 
         if Match.objects.exists():
             self.stdout.write(self.style.WARNING(
@@ -48,71 +54,75 @@ class Command(BaseCommand):
             ))
 
         # --- PHASE 1: Generate First Leg Fixtures (Home Matches) ---
-        self.stdout.write(self.style.SUCCESS(f'--- Generating First Leg Fixtures for {num_actual_teams} Teams ---'))
-
-        current_datetime = start_date # Use current_datetime for timezone-aware date
-
-        for round_num in range(total_rounds):
-            if round_num > 0:
-                current_datetime += datetime.timedelta(days=days_between_weeks)
-                
-            self.stdout.write(f'--- Round {round_num + 1} (Date: {current_datetime.strftime(date_format)}) ---')
-            
-            half_size = num_teams // 2
-
-            for i in range(half_size):
-                team1 = teams[i]
-                team2 = teams[i + half_size]
-                
+        # Circle design: in round k the pivot meets team k, and every other
+        # pair (i, j) satisfies i + j = 2k (mod n - 1), so no list rotation is needed.
+        return_offset = datetime.timedelta(days=(total_rounds * days_between_weeks))
+
+        for k in range(total_rounds):
+            round_datetime = start_date + datetime.timedelta(days=k * days_between_weeks)
+
+            # Alternate the pivot's home/away so it is not at home every week
+            pairs = [(teams[k], pivot) if k % 2 == 0 else (pivot, teams[k])]
+            for i in range(1, num_teams // 2):
+                pairs.append((teams[(k + i) % total_rounds], teams[(k - i) % total_rounds]))
+
+            for team1, team2 in pairs:
                 if team1 and team2:
                     # Leg 1 (Home)
-                    match_home = Match(
+                    all_matches_to_save.append(Match(
                         home_team=team1,
                         away_team=team2,
-                        match_date=current_datetime, # Use the timezone-aware date
+                        match_date=round_datetime, # Use the timezone-aware date
                         is_played=False
-                    )
-                    all_matches_to_save.append(match_home)
-                    self.stdout.write(f'  - {team1.name} vs {team2.name}')
+                    ))
 
-            teams.insert(1, teams.pop())
-        
         # --- PHASE 2: Generate Second Leg Fixtures (Away Matches) ---
-        
-        leg1_matches_copy = all_matches_to_save[:]
-        
+        # Mirror of the first leg, shifted by one full leg
         if num_actual_teams > 2:
-            self.stdout.write(self.style.SUCCESS('\n--- Generating Second Leg (Return) Fixtures ---'))
-            for match in leg1_matches_copy:
-                # Calculate return date based on original date
-                return_datetime = match.match_date + datetime.timedelta(days=(total_rounds * days_between_weeks))
-
-                match_away = Match(
+            all_matches_to_save += [
+                Match(
                     home_team=match.away_team,
                     away_team=match.home_team,
-                    match_date=return_datetime, # Use the calculated timezone-aware date
+                    match_date=match.match_date + return_offset,
                     is_played=False
                 )
-                all_matches_to_save.append(match_away)
-                self.stdout.write(f'  - {match_away.home_team.name} vs {match_away.away_team.name} (Return Leg)')
+                for match in all_matches_to_save
+            ]
 
+        self.stdout.write(self.style.SUCCESS(
+            f'--- Generated {len(all_matches_to_save)} fixtures over {total_rounds} rounds per leg for {num_actual_teams} Teams ---'
+        ))
+        if verbosity >= 2:
+            self.stdout.write('\n'.join(
+                f'  - {match.match_date.strftime(date_format)}: {match.home_team.name} vs {match.away_team.name}'
+                for match in all_matches_to_save
+            ))
 
-        # --- PHASE 3: Commit Matches Individually (The Critical Fix) ---
+        # --- PHASE 3: Commit Matches in Bulk ---
         total_matches = len(all_matches_to_save)
         self.stdout.write(self.style.NOTICE(f'\n--- Committing {total_matches} matches to database... ---'))
 
+        batch_size = 500
         count = 0
+        progress = []
         try:
-            for match in all_matches_to_save:
-                match.save()
-                count += 1
-                if count % 10 == 0:
-                    self.stdout.write(f'Progress: {count}/{total_matches} saved.')
+            with transaction.atomic():
+                for offset in range(0, total_matches, batch_size):
+                    batch = all_matches_to_save[offset:offset + batch_size]
+                    Match.objects.bulk_create(batch, batch_size=batch_size)
+                    count += len(batch)
+                    progress.append(f'Progress: {count}/{total_matches} saved.')
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"\nCRITICAL SAVE ERROR: {e}"))
             connection.close()
             return
 
+        if verbosity >= 2:
+            self.stdout.write('\n'.join(progress))
+
+        # bulk_create skips post_save, so drop the cached schedule explicitly
+        caches['league'].clear()
+
         connection.close() 
 
         self.stdout.write(self.style.SUCCESS(
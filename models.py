@@ -1,42 +1,55 @@
-from django.db import models
+from django.core.cache import caches
+from django.db import models, transaction
 from django.db.models import Q, F
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
 from django.utils.text import slugify
 from django.utils import timezone
 import datetime # Kept for datetime manipulation
+from dataclasses import dataclass
+
+# League table order (points, then goal difference, then goals scored).
+# Shared by the Team index and get_standings() so the ORDER BY stays index-backed.
+STANDINGS_ORDERING = ['-points', '-goal_difference', '-goals_for']
+
+# Team columns maintained only by Match.save() / match deletion via F() updates
+STANDINGS_COUNTERS = (
+    'matches_played', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'goal_difference', 'points',
+)
+
+# --- Standings Row (one per team in the league table) ---
+@dataclass(slots=True)
+class Standing:
+    team: 'Team'
+    P: int
+    W: int
+    D: int
+    L: int
+    GF: int
+    GA: int
+    GD: int
+    Pts: int
+
 
 # --- Team Standings Manager (Required for Standings View) ---
 class TeamStandingsManager(models.Manager):
     def get_standings(self):
-        teams = self.get_queryset().all()
-        standings = []
-        for team in teams:
-            played_home = Match.objects.filter(home_team=team, is_played=True)
-            played_away = Match.objects.filter(away_team=team, is_played=True)
-            all_played = played_home | played_away 
-            stats = {
-                'team': team, 'P': all_played.count(),
-                'W': 0, 'D': 0, 'L': 0,
-                'GF': 0, 'GA': 0, 'GD': 0, 'Pts': 0
-            }
-            for match in all_played:
-                if match.home_team == team:
-                    gf, ga = match.home_score, match.away_score
-                else: 
-                    gf, ga = match.away_score, match.home_score
-                stats['GF'] += gf
-                stats['GA'] += ga
-                if gf > ga:
-                    stats['W'], stats['Pts'] = stats['W'] + 1, stats['Pts'] + 3
-                elif gf == ga:
-                    stats['D'], stats['Pts'] = stats['D'] + 1, stats['Pts'] + 1
-                else:
-                    stats['L'] += 1
-            stats['GD'] = stats['GF'] - stats['GA']
-            standings.append(stats)
-        standings.sort(
-            key=lambda x: (x['Pts'], x['GD'], x['GF']), reverse=True
-        )
-        return standings
+        # The counters are kept current by Match.save(), so the table is a
+        # single indexed ORDER BY instead of a recomputation per request
+        teams = self.get_queryset().only(
+            'name', 'slug', 'matches_played', 'wins', 'draws', 'losses',
+            'goals_for', 'goals_against', 'goal_difference', 'points',
+        ).order_by(*STANDINGS_ORDERING)
+        return [
+            Standing(
+                team=team, P=team.matches_played,
+                W=team.wins, D=team.draws, L=team.losses,
+                GF=team.goals_for, GA=team.goals_against, GD=team.goal_difference,
+                Pts=team.points,
+            )
+            for team in teams
+        ]
 
 # ----------------------------------------------------
 # --- CORE MODELS (ADDED MISSING FIELDS) ---
@@ -63,10 +76,20 @@ class Team(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=STANDINGS_ORDERING, name='team_standings_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        if not self._state.adding:
+            # Never write the standings counters from a (possibly stale)
+            # instance; only the F() updates from Match results touch them
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [f.name for f in self._meta.concrete_fields if not f.primary_key]
+            kwargs['update_fields'] = [f for f in update_fields if f not in STANDINGS_COUNTERS]
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -95,16 +118,59 @@ class Match(models.Model):
     class Meta:
         ordering = ['match_date']
         verbose_name_plural = "Matches"
+        indexes = [
+            # Backs the default ordering (schedule, admin changelist)
+            models.Index(fields=['match_date'], name='match_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.home_team} vs {self.away_team} ({self.match_date.strftime('%Y-%m-%d')})"
 
     def save(self, *args, **kwargs):
-        if self.home_score > 0 or self.away_score > 0:
-            self.is_played = True
-        else:
-            self.is_played = False
-        super().save(*args, **kwargs)
+        # is_played is set explicitly (admin checkbox); a 0-0 draw is still played
+        with transaction.atomic():
+            # Lock the stored row so concurrent saves of the same match
+            # cannot both reverse the same previous result
+            previous = None
+            if self.pk:
+                previous = Match.objects.select_for_update().filter(pk=self.pk).values(
+                    'home_team_id', 'away_team_id', 'home_score', 'away_score', 'is_played'
+                ).first()
+
+            super().save(*args, **kwargs)
+            deltas = {}
+            if previous and previous['is_played']:
+                self._add_result(deltas, previous['home_team_id'], previous['away_team_id'],
+                                 previous['home_score'], previous['away_score'], -1)
+            if self.is_played:
+                self._add_result(deltas, self.home_team_id, self.away_team_id,
+                                 self.home_score, self.away_score, 1)
+            self._apply_standings(deltas)
+
+    @staticmethod
+    def _add_result(deltas, home_team_id, away_team_id, home_score, away_score, sign):
+        """Accumulates the standings counters one result adds (sign=1) or removes (sign=-1)."""
+        for team_id, gf, ga in ((home_team_id, home_score, away_score),
+                                (away_team_id, away_score, home_score)):
+            row = deltas.setdefault(team_id, {})
+            for field, value in (
+                ('matches_played', 1),
+                ('wins', int(gf > ga)),
+                ('draws', int(gf == ga)),
+                ('losses', int(gf < ga)),
+                ('goals_for', gf),
+                ('goals_against', ga),
+                ('goal_difference', gf - ga),
+                ('points', 3 if gf > ga else int(gf == ga)),
+            ):
+                row[field] = row.get(field, 0) + sign * value
+
+    @staticmethod
+    def _apply_standings(deltas):
+        for team_id, row in deltas.items():
+            changes = {field: F(field) + value for field, value in row.items() if value}
+            if changes:
+                Team.objects.filter(pk=team_id).update(**changes)
 
     def get_winner(self):
         if not self.is_played:
@@ -121,9 +187,14 @@ class Match(models.Model):
 class Player(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
-    jersey_number = models.IntegerField(unique=True)
+    jersey_number = models.IntegerField()
     id_number = models.CharField(max_length=20, unique=True, blank=True, null=True)
 
+    class Meta:
+        # Jersey numbers only need to be unique within a squad; the
+        # constraint's index also serves the roster's per-team lookups
+        unique_together = ('team', 'jersey_number')
+
     def __str__(self):
         return f"{self.name} ({self.team.name})"
 
@@ -165,4 +236,33 @@ class MatchReport(models.Model):
     is_verified = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"Report for {self.match}"
\ No newline at end of file
+        return f"Report for {self.match}"
+
+
+# --- Standings Bookkeeping ---
+# pre_delete fires once per object for instance, queryset and cascade deletes
+# alike (Match.delete() alone would miss the last two), and runs inside the
+# delete transaction.
+@receiver(pre_delete, sender=Match)
+def reverse_match_result(sender, instance, **kwargs):
+    stored = Match.objects.select_for_update().filter(pk=instance.pk).values(
+        'home_team_id', 'away_team_id', 'home_score', 'away_score', 'is_played'
+    ).first()
+    if stored and stored['is_played']:
+        deltas = {}
+        Match._add_result(deltas, stored['home_team_id'], stored['away_team_id'],
+                          stored['home_score'], stored['away_score'], -1)
+        Match._apply_standings(deltas)
+
+
+# --- Cache Invalidation ---
+# The standings and schedule pages are cached in the dedicated 'league' cache;
+# results, goals, team and player names change rarely, so any such write drops
+# the cached pages. Clearing waits for the commit, otherwise a concurrent
+# request could re-cache the pre-commit table.
+@receiver([post_save, post_delete], sender=Match)
+@receiver([post_save, post_delete], sender=Goal)
+@receiver([post_save, post_delete], sender=Team)
+@receiver([post_save, post_delete], sender=Player)
+def clear_league_cache(sender, **kwargs):
+    transaction.on_commit(lambda: caches['league'].clear())
\ No newline at end of file
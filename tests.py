@@ -1,3 +1,268 @@
-from django.test import TestCase
+from collections import Counter
+from importlib import import_module
+from io import StringIO
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from .models import Team, Match, Player, Goal
+
+# Keep the tests away from the deployment's on-disk 'league' cache
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'league': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+COUNTERS = (
+    'matches_played', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'goal_difference', 'points',
+)
+
+
+def counters(team):
+    return dict(Team.objects.filter(pk=team.pk).values(*COUNTERS).get())
+
+
+def expected(P=0, W=0, D=0, L=0, GF=0, GA=0):
+    return dict(zip(COUNTERS, (P, W, D, L, GF, GA, GF - GA, W * 3 + D)))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StandingsCountersTests(TestCase):
+    def setUp(self):
+        self.home = Team.objects.create(name='Home FC')
+        self.away = Team.objects.create(name='Away FC')
+
+    def play(self, home_score, away_score, is_played=True):
+        return Match.objects.create(
+            home_team=self.home, away_team=self.away,
+            home_score=home_score, away_score=away_score, is_played=is_played,
+        )
+
+    def test_unplayed_match_does_not_count(self):
+        self.play(0, 0, is_played=False)
+        self.assertEqual(counters(self.home), expected())
+        self.assertEqual(counters(self.away), expected())
+
+    def test_played_result_updates_both_teams(self):
+        self.play(2, 1)
+        self.assertEqual(counters(self.home), expected(P=1, W=1, GF=2, GA=1))
+        self.assertEqual(counters(self.away), expected(P=1, L=1, GF=1, GA=2))
+
+    def test_goalless_draw_counts_as_played(self):
+        self.play(0, 0)
+        self.assertEqual(counters(self.home), expected(P=1, D=1))
+        self.assertEqual(counters(self.away), expected(P=1, D=1))
+
+    def test_resave_with_changed_score_replaces_previous_result(self):
+        match = self.play(2, 1)
+        match.home_score, match.away_score = 1, 3
+        match.save()
+        match.save()  # re-saving without changes must not double count
+        self.assertEqual(counters(self.home), expected(P=1, L=1, GF=1, GA=3))
+        self.assertEqual(counters(self.away), expected(P=1, W=1, GF=3, GA=1))
+
+    def test_unmarking_played_removes_result(self):
+        match = self.play(2, 1)
+        match.is_played = False
+        match.save()
+        self.assertEqual(counters(self.home), expected())
+        self.assertEqual(counters(self.away), expected())
+
+    def test_instance_delete_removes_result(self):
+        self.play(2, 1).delete()
+        self.assertEqual(counters(self.home), expected())
+        self.assertEqual(counters(self.away), expected())
+
+    def test_queryset_delete_removes_result(self):
+        match = self.play(2, 1)
+        Match.objects.filter(pk=match.pk).delete()
+        self.assertEqual(counters(self.home), expected())
+        self.assertEqual(counters(self.away), expected())
+
+    def test_team_delete_cascade_removes_result_from_opponent(self):
+        self.play(2, 1)
+        self.home.delete()
+        self.assertEqual(counters(self.away), expected())
+
+    def test_standings_order(self):
+        third = Team.objects.create(name='Third FC')
+        self.play(2, 1)
+        Match.objects.create(home_team=third, away_team=self.away, home_score=1, away_score=1, is_played=True)
+        table = Team.standings_manager.get_standings()
+        self.assertEqual([row.team for row in table], [self.home, third, self.away])
+        self.assertEqual([row.Pts for row in table], [3, 1, 1])
+
+    def test_stale_team_save_keeps_counters(self):
+        match = self.play(3, 0)
+        match.home_team.contact_person = 'Coach'
+        match.home_team.save()  # instance loaded before the result was applied
+        self.assertEqual(counters(self.home), expected(P=1, W=1, GF=3))
+        self.assertEqual(Team.objects.get(pk=self.home.pk).contact_person, 'Coach')
+
+    def test_team_admin_does_not_reset_counters(self):
+        self.client.force_login(User.objects.create_superuser('root', password='pw'))
+        self.play(3, 0)
+        response = self.client.post(f'/admin/league/team/{self.home.pk}/change/', {
+            'name': 'Home FC', 'slug': self.home.slug, 'contact_person': 'Coach', 'contact_number': '',
+            'points': 0, 'wins': 0,  # read-only in the form; must be ignored
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(counters(self.home), expected(P=1, W=1, GF=3))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BackfillStandingsMigrationTests(TestCase):
+    def test_backfill_matches_recomputation_from_scratch(self):
+        backfill_standings = import_module('league.migrations.0003_team_standings_idx').backfill_standings
+        a, b, c = (Team.objects.create(name=name) for name in ('A', 'B', 'C'))
+        Match.objects.bulk_create([
+            Match(home_team=a, away_team=b, home_score=3, away_score=0, is_played=True),
+            Match(home_team=b, away_team=c, home_score=2, away_score=2, is_played=True),
+            Match(home_team=c, away_team=a, home_score=1, away_score=0, is_played=True),
+            Match(home_team=a, away_team=c, home_score=5, away_score=0, is_played=False),
+        ])
+        # Stale values the backfill has to overwrite
+        Team.objects.update(points=99, wins=7)
+
+        backfill_standings(apps, None)
+
+        self.assertEqual(counters(a), expected(P=2, W=1, L=1, GF=3, GA=1))
+        self.assertEqual(counters(b), expected(P=2, D=1, L=1, GF=2, GA=5))
+        self.assertEqual(counters(c), expected(P=2, W=1, D=1, GF=3, GA=2))
+
+
+# TransactionTestCase: the command closes the DB connection when it finishes
+@override_settings(CACHES=TEST_CACHES)
+class GenerateFixturesTests(TransactionTestCase):
+    def generate(self, num_teams):
+        teams = [Team.objects.create(name=f'Team {i}') for i in range(num_teams)]
+        call_command('generate_fixtures', verbosity=0, stdout=StringIO())
+        return teams, list(Match.objects.values_list('home_team_id', 'away_team_id', 'match_date'))
+
+    def assert_round_robin(self, num_teams):
+        teams, fixtures = self.generate(num_teams)
+        ids = [team.pk for team in teams]
+
+        # Every ordered pairing exactly once: each side hosts the other once
+        pairings = Counter((home, away) for home, away, _ in fixtures)
+        self.assertEqual(set(pairings), {(h, a) for h in ids for a in ids if h != a})
+        self.assertEqual(set(pairings.values()), {1})
+
+        # Nobody plays twice on the same match day
+        appearances = Counter((date, team) for home, away, date in fixtures for team in (home, away))
+        self.assertEqual(set(appearances.values()), {1})
+
+        # Home games are split evenly
+        self.assertEqual(set(Counter(home for home, _, _ in fixtures).values()), {num_teams - 1})
+
+        # One match day per round, n - 1 rounds (n rounded up to even) per leg
+        rounds = sorted({date for _, _, date in fixtures})
+        self.assertEqual(len(rounds), 2 * ((num_teams + num_teams % 2) - 1))
+
+    def test_even_number_of_teams(self):
+        self.assert_round_robin(6)
+
+    def test_odd_number_of_teams_gets_byes(self):
+        self.assert_round_robin(5)
+
+    def test_two_teams_play_a_single_fixture(self):
+        teams, fixtures = self.generate(2)
+        self.assertEqual(len(fixtures), 1)
+        self.assertEqual({fixtures[0][0], fixtures[0][1]}, {team.pk for team in teams})
+
+    def test_needs_at_least_two_teams(self):
+        Team.objects.create(name='Lonely FC')
+        with self.assertRaises(CommandError):
+            call_command('generate_fixtures', verbosity=0, stdout=StringIO())
+
+
+@override_settings(CACHES=TEST_CACHES)
+class MatchAdminScoreTests(TestCase):
+    def setUp(self):
+        self.home = Team.objects.create(name='Home FC')
+        self.away = Team.objects.create(name='Away FC')
+        self.striker = Player.objects.create(team=self.home, name='Striker', jersey_number=9)
+        self.winger = Player.objects.create(team=self.away, name='Winger', jersey_number=7)
+        self.match = Match.objects.create(home_team=self.home, away_team=self.away, is_played=True)
+        self.goal = Goal.objects.create(match=self.match, scorer=self.striker, team=self.home, minute=10)
+
+    def login(self, *perms):
+        user = User.objects.create_user('staff', password='pw', is_staff=True)
+        user.user_permissions.set(Permission.objects.filter(codename__in=perms))
+        self.client.force_login(user)
+
+    def post_change(self, goals):
+        data = {
+            'home_team': self.home.pk, 'away_team': self.away.pk,
+            'match_date_0': '2026-01-01', 'match_date_1': '10:00', 'venue': '', 'is_played': 'on',
+            'goals-TOTAL_FORMS': len(goals), 'goals-INITIAL_FORMS': 1,
+            'card_set-TOTAL_FORMS': 0, 'card_set-INITIAL_FORMS': 0,
+            'matchreport-TOTAL_FORMS': 0, 'matchreport-INITIAL_FORMS': 0,
+        }
+        for i, goal in enumerate(goals):
+            data.update({f'goals-{i}-{field}': value for field, value in goal.items()})
+        return self.client.post(f'/admin/league/match/{self.match.pk}/change/', data)
+
+    def test_score_follows_inline_goals(self):
+        self.login('change_match', 'add_goal', 'change_goal', 'delete_goal', 'view_team', 'view_player')
+        existing = {'id': self.goal.pk, 'match': self.match.pk, 'scorer': self.striker.pk,
+                    'team': self.home.pk, 'minute': 10, 'DELETE': 'on'}
+        added = {'scorer': self.winger.pk, 'team': self.away.pk, 'minute': 80}
+        response = self.post_change([existing, added])
+        self.assertEqual(response.status_code, 302)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.home_score, self.match.away_score), (0, 1))
+
+    def test_view_only_goal_inline_keeps_score(self):
+        self.login('change_match', 'view_goal')
+        # View-only inline rows are not posted back beyond their id
+        response = self.post_change([{'id': self.goal.pk, 'match': self.match.pk}])
+        self.assertEqual(response.status_code, 302)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.home_score, self.match.away_score), (1, 0))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StandingsViewTests(TestCase):
+    def test_top_scorers_are_listed(self):
+        home = Team.objects.create(name='Home FC')
+        away = Team.objects.create(name='Away FC')
+        striker = Player.objects.create(team=home, name='Striker', jersey_number=9)
+        winger = Player.objects.create(team=away, name='Winger', jersey_number=7)
+        match = Match.objects.create(home_team=home, away_team=away, home_score=2, away_score=1, is_played=True)
+        for scorer, team in ((striker, home), (striker, home), (winger, away)):
+            Goal.objects.create(match=match, scorer=scorer, team=team, minute=1)
+
+        response = self.client.get('/league/standings/')
+        self.assertEqual(
+            [(row['player__name'], row['player__team__name'], row['total_goals'])
+             for row in response.context['top_scorers']],
+            [('Striker', 'Home FC', 2), ('Winger', 'Away FC', 1)],
+        )
+        self.assertContains(response, '2 Goals')
+
+
+@override_settings(CACHES={
+    **TEST_CACHES,
+    'league': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'league-tests'},
+})
+class LeagueCacheTests(TestCase):
+    def setUp(self):
+        self.team = Team.objects.create(name='Old Name FC')
+        self.url = '/league/standings/'
+
+    def test_page_is_cached_until_a_commit_clears_it(self):
+        self.assertContains(self.client.get(self.url), 'Old Name FC')
+
+        self.team.name = 'New Name FC'
+        self.team.save()
+        # Not cleared before the transaction commits
+        self.assertContains(self.client.get(self.url), 'Old Name FC')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Team.objects.get(pk=self.team.pk).save()
+        self.assertContains(self.client.get(self.url), 'New Name FC')
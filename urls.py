@@ -3,12 +3,7 @@ URL configuration for meru_ff_project project.
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.shortcuts import redirect
-
-# Function to redirect the root URL to the standings page
-def home_redirect(request):
-    # This redirect is now safe because we are correctly using the league: namespace
-    return redirect('league:standings')
+from django.views.generic import RedirectView
 
 urlpatterns = [
     # Admin Panel URL
@@ -16,7 +11,7 @@ urlpatterns = [
     
     # NEW: Redirects the base URL (/) to the 'standings' page
     # This pattern is named 'home', which is what was failing in your base.html
-    path('', home_redirect, name='home'), 
+    path('', RedirectView.as_view(pattern_name='league:standings', permanent=False), name='home'), 
     
     # Links the '/league/' path to your app's urls.py
     # CRITICAL FIX: We are including the namespace argument here.
@@ -1,42 +1,61 @@
 from django.shortcuts import render, get_object_or_404
 from django.db import transaction
-from django.db.models import Count, F, Q
-from .models import Team, Match, Player # Ensure all models are imported
+from django.db.models import Count, F, Prefetch
+from django.views.decorators.cache import cache_page
+from .models import Team, Match, Player, Goal, Card # Ensure all models are imported
 
 # --- STANDINGS VIEW ---
+@cache_page(60 * 10, cache='league', key_prefix='league')
 def standings(request):
     """
     Retrieves the league standings and top scorers.
     """
     final_standings = Team.standings_manager.get_standings()
     
-    scorers = Player.objects.annotate(
-        goals_count=Count('goal') 
-    ).filter(
-        goals_count__gt=0
+    # GROUP BY on the (sparse) Goal table rather than LEFT JOINing every Player
+    top = Goal.objects.values(
+        'scorer_id', 'scorer__name', 'scorer__team__name'
+    ).annotate(
+        goals_count=Count('id')
     ).order_by(
         '-goals_count', 
-        'name'
+        'scorer__name'
     )[:10]
+    # Keys as read by the standings template
+    top_scorers = [
+        {
+            'player__name': row['scorer__name'],
+            'player__team__name': row['scorer__team__name'],
+            'total_goals': row['goals_count'],
+        }
+        for row in top
+    ]
 
     context = {
         'title': 'League Standings',
         'standings_list': final_standings, 
-        'scorers': scorers, 
+        'top_scorers': top_scorers, 
     }
     return render(request, 'league/standings.html', context)
 
 
 # --- SCHEDULE VIEW (UPDATED to show all matches) ---
+@cache_page(60 * 10, cache='league', key_prefix='league')
 def schedule(request):
     """Displays a list of all matches, separated into Played and Upcoming."""
     
-    # Fetch ALL matches ordered by date
-    all_matches = Match.objects.all().order_by('match_date')
+    # Fetch ALL matches ordered by date in a single query, limited to the
+    # columns the template renders
+    all_matches = list(
+        Match.objects.select_related('home_team', 'away_team')
+                     .only('match_date', 'venue', 'is_played', 'home_score', 'away_score',
+                           'home_team__name', 'away_team__name')
+                     .order_by('match_date')
+    )
     
     # Separate the list into two for display in the template
-    played_matches = all_matches.filter(is_played=True)
-    upcoming_matches = all_matches.filter(is_played=False)
+    played_matches = [m for m in all_matches if m.is_played]
+    upcoming_matches = [m for m in all_matches if not m.is_played]
     
     context = {
         # Both lists are now passed to the template
@@ -63,21 +82,35 @@ def roster(request, team_slug):
     """
     Displays the roster and statistics for a single team.
     """
-    team = get_object_or_404(Team, slug=team_slug)
+    # Only the columns the roster header renders (contact_person included,
+    # otherwise the template would trigger a deferred-field query)
+    team = get_object_or_404(Team.objects.only('id', 'name', 'slug', 'contact_person'), slug=team_slug)
     
     # --- STATS AGGREGATION ---
-    players = team.player_set.annotate(
-        total_goals=Count('goal'),
-        yellow_cards=Count(
-            'card', 
-            filter=Q(card__card_type='Y')
-        ),
-        red_cards=Count(
-            'card', 
-            filter=Q(card__card_type__in=['R', '2Y'])
+    # Goals and cards are counted in separate GROUP BY queries; annotating
+    # both onto the players would join the two tables and multiply rows
+    goal_counts = dict(
+        Goal.objects.filter(scorer__team_id=team.id)
+                    .values_list('scorer_id')
+                    .annotate(c=Count('id'))
+                    .order_by()
+    )
+    card_counts = {}
+    for player_id, card_type, c in (
+        Card.objects.filter(player__team_id=team.id)
+                    .values_list('player_id', 'card_type')
+                    .annotate(c=Count('id'))
+                    .order_by()
+    ):
+        card_counts[player_id, card_type] = c
+
+    players = list(Player.objects.filter(team_id=team.id).order_by('jersey_number'))
+    for player in players:
+        player.total_goals = goal_counts.get(player.pk, 0)
+        player.yellow_cards = card_counts.get((player.pk, 'Y'), 0)
+        player.red_cards = (
+            card_counts.get((player.pk, 'R'), 0) + card_counts.get((player.pk, '2Y'), 0)
         )
-        
-    ).order_by('jersey_number')
 
     context = {
         'title': f'{team.name} Roster',
@@ -92,20 +125,25 @@ def match_detail(request, match_pk):
     """
     Displays details, goals, and cards for a single match.
     """
-    # Pre-fetch the related match objects
+    # Pre-fetch the related match objects (goals and cards already ordered)
     match = get_object_or_404(
         Match.objects.select_related('home_team', 'away_team', 'referee', 'matchreport')
-                     .prefetch_related('goals', 'card_set'), 
+                     .prefetch_related(
+                         Prefetch('goals', queryset=Goal.objects.select_related('scorer', 'team').order_by('minute'),
+                                  to_attr='all_goals'),
+                         # FIX: Use 'player__team' in select_related to efficiently fetch the team 
+                         # through the player, since 'team' is not a direct FK on the Card model.
+                         Prefetch('card_set', queryset=Card.objects.select_related('player__team').order_by('minute'),
+                                  to_attr='all_cards'),
+                     ), 
         pk=match_pk
     ) 
     
-    # Separate goals for each team
-    home_goals = match.goals.filter(team=match.home_team).order_by('minute')
-    away_goals = match.goals.filter(team=match.away_team).order_by('minute')
-    
-    # FIX: Use 'player__team' in select_related to efficiently fetch the team 
-    # through the player, since 'team' is not a direct FK on the Card model.
-    all_cards = match.card_set.select_related('player__team').order_by('minute')
+    # Separate goals for each team from the prefetched list (a .filter() here
+    # would go back to the database)
+    home_goals = [g for g in match.all_goals if g.team_id == match.home_team_id]
+    away_goals = [g for g in match.all_goals if g.team_id == match.away_team_id]
+    all_cards = match.all_cards
 
     context = {
         'title': f'{match.home_team.name} vs {match.away_team.name}',